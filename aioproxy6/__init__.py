@@ -4,11 +4,20 @@ from .models import (
     PriceInfo, ProlongProxyInfo, ProlongResult, 
     BuyResult, DeleteResult, CheckResult, ApiResponse
 )
+from .connectors import ProxyConnectorPool
+from .transports import (
+    BaseTransport, HttpTransport, RecordingTransport,
+    ReplayTransport, FakeTransport, BatchingTransport, MissingRecordingError,
+    BatchResultError
+)
 
 __version__ = '1.0.0'
 __all__ = [
     'PX6Client', 'ProxyVersion', 'ProxyType', 'ProxyState',
     'ProxyInfo', 'ProxyList', 'CountryList', 'CountInfo',
     'PriceInfo', 'ProlongProxyInfo', 'ProlongResult',
-    'BuyResult', 'DeleteResult', 'CheckResult', 'ApiResponse'
+    'BuyResult', 'DeleteResult', 'CheckResult', 'ApiResponse',
+    'ProxyConnectorPool', 'BaseTransport', 'HttpTransport',
+    'RecordingTransport', 'ReplayTransport', 'FakeTransport',
+    'BatchingTransport', 'MissingRecordingError', 'BatchResultError'
 ] 
\ No newline at end of file
@@ -9,6 +9,8 @@ from .models import (
     PriceInfo, ProlongProxyInfo, ProlongResult, 
     BuyResult, DeleteResult, CheckResult, ApiResponse
 )
+from .connectors import ProxyConnectorPool
+from .transports import BaseTransport, HttpTransport
 
 
 class ProxyVersion(Enum):
@@ -45,28 +47,65 @@ class PX6Client:
     """Клиент для работы с API px6.link"""
 
     BASE_URL = "https://px6.link/api"
+    # Максимальное количество запоминаемых типов прокси, установленных через set_proxy_type
+    PROXY_TYPES_LIMIT = 10000
 
-    def __init__(self, api_key: str, session: Optional[aiohttp.ClientSession] = None):
+    def __init__(self, api_key: str,
+                 session: Optional[aiohttp.ClientSession] = None,
+                 connector_cache_size: int = 128,
+                 transport: Optional[BaseTransport] = None):
         """
         Инициализация клиента
 
         Args:
             api_key: API ключ
             session: Сессия aiohttp (если None, будет создана новая)
+            connector_cache_size: Размер LRU-кэша коннекторов для прокси
+            transport: Транспорт для запросов к API (если None, используется HttpTransport).
+                Не может быть задан вместе с session
+
+        Raises:
+            ValueError: Если заданы одновременно session и transport
 
         """
+        if session is not None and transport is not None:
+            raise ValueError("session and transport are mutually exclusive")
         self.api_key = api_key
-        self._session = session
-        self._own_session = session is None
+        self.transport = transport or HttpTransport(api_key, session, self.BASE_URL)
+        self.connectors = ProxyConnectorPool(connector_cache_size)
+        # Типы, установленные через set_proxy_type, до получения свежего списка прокси
+        self._proxy_types: Dict[int, str] = {}
 
     async def __aenter__(self):
-        if self._own_session:
-            self._session = aiohttp.ClientSession()
+        await self.transport.open()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self._own_session and self._session:
-            await self._session.close()
+        await self.transport.close()
+        await self.connectors.close()
+
+    async def get_connector(self, proxy: ProxyInfo) -> aiohttp.BaseConnector:
+        """
+        Получение коннектора для работы через прокси
+
+        Коннектор берется из LRU-кэша клиента, поэтому keep-alive соединения
+        через прокси переиспользуются. Сессию следует создавать
+        с connector_owner=False, а запросы выполнять с proxy.request_kwargs.
+
+        Если тип прокси был изменен через set_proxy_type, он переносится
+        в переданный объект proxy, и его URL, авторизация и фабрика
+        коннекторов пересчитываются.
+
+        Args:
+            proxy: Информация о прокси
+
+        Returns:
+            Коннектор aiohttp
+        """
+        proxy_type = self._proxy_types.get(proxy.id)
+        if proxy_type is not None and proxy.type != proxy_type:
+            proxy.type = proxy_type
+        return await self.connectors.get(proxy)
 
     async def _request(self, method: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
@@ -82,20 +121,13 @@ class PX6Client:
         Raises:
             PX6Exception: Если API вернул ошибку
         """
-        if self._session is None:
-            self._session = aiohttp.ClientSession()
-            self._own_session = True
-
-        # Формируем URL согласно документации: https://px6.link/api/{api_key}?method={method}&{params}
-        url = f"{self.BASE_URL}/{self.api_key}/{method}"
-        async with self._session.get(url, params=params) as response:
-            data = await response.json()
-            if data.get("status") == "no":
-                error_id = int(data.get("error_id", 0))
-                error = data.get("error", "Unknown error")
-                raise PX6Exception(error_id, error)
+        data = await self.transport.request(method, params)
+        if data.get("status") == "no":
+            error_id = int(data.get("error_id", 0))
+            error = data.get("error", "Unknown error")
+            raise PX6Exception(error_id, error)
 
-            return data
+        return data
 
     async def get_price(self, count: int, period: int, version: ProxyVersion = ProxyVersion.IPV6) -> PriceInfo:
         """
@@ -185,11 +217,17 @@ class PX6Client:
             params["nokey"] = 1
             
         data = await self._request("getproxy", params)
-        return ProxyList.from_dict(data)
+        result = ProxyList.from_dict(data)
+        for proxy in result.proxies_list:
+            self._proxy_types.pop(proxy.id, None)
+        return result
     
     async def set_proxy_type(self, proxy_ids: List[int], proxy_type: ProxyType) -> ApiResponse:
         """
         Установка типа прокси
+
+        Коннекторы этих прокси удаляются из кэша, а новый тип применяется
+        к объектам ProxyInfo при следующем вызове get_connector.
         
         Args:
             proxy_ids: Список ID прокси
@@ -204,6 +242,13 @@ class PX6Client:
         }
         
         data = await self._request("settype", params)
+        for proxy_id in proxy_ids:
+            # Повторная вставка переносит ID в конец, вытесняются самые старые
+            self._proxy_types.pop(proxy_id, None)
+            self._proxy_types[proxy_id] = proxy_type.value
+        while len(self._proxy_types) > self.PROXY_TYPES_LIMIT:
+            del self._proxy_types[next(iter(self._proxy_types))]
+        await self.connectors.invalidate(proxy_ids)
         return ApiResponse.from_dict(data)
     
     async def set_description(self, new_descr: str,
@@ -319,6 +364,8 @@ class PX6Client:
             params["descr"] = descr
             
         data = await self._request("delete", params)
+        for proxy_id in proxy_ids or ():
+            self._proxy_types.pop(proxy_id, None)
         return DeleteResult.from_dict(data)
     
     async def check_proxy(self, proxy_id: int) -> CheckResult:
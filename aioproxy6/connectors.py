@@ -0,0 +1,127 @@
+import asyncio
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Set, Tuple
+
+import aiohttp
+
+from .models import ProxyInfo
+
+
+class ProxyConnectorPool:
+    """
+    LRU-кэш открытых коннекторов aiohttp по прокси
+
+    Хранит не более max_size коннекторов, чтобы keep-alive соединения
+    через каждый прокси переиспользовались между сессиями. Коннекторы
+    принадлежат пулу: сессии нужно создавать с connector_owner=False.
+
+    Вытесненные и устаревшие коннекторы закрываются в фоне спустя
+    close_delay секунд, чтобы не прерывать выполняющиеся через них запросы.
+    Запросы, которые длятся дольше close_delay после вытеснения коннектора,
+    будут прерваны.
+    """
+
+    def __init__(self, max_size: int = 128, close_delay: float = 60.0):
+        """
+        Инициализация пула
+
+        Args:
+            max_size: Максимальное количество открытых коннекторов
+            close_delay: Задержка закрытия вытесненных коннекторов (в секундах)
+
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be positive")
+        self.max_size = max_size
+        self.close_delay = close_delay
+        self._connectors: 'OrderedDict[Tuple[int, str], aiohttp.BaseConnector]' = OrderedDict()
+        self._keys: Dict[int, Tuple[int, str]] = {}
+        self._retired: Dict[aiohttp.BaseConnector, asyncio.TimerHandle] = {}
+        self._closing: Set[asyncio.Future] = set()
+
+    def __len__(self) -> int:
+        return len(self._connectors)
+
+    async def get(self, proxy: ProxyInfo) -> aiohttp.BaseConnector:
+        """
+        Получение коннектора для прокси
+
+        Args:
+            proxy: Информация о прокси
+
+        Returns:
+            Открытый коннектор, созданный фабрикой proxy.connector_factory
+        """
+        key = proxy.connector_key
+        connector = self._connectors.get(key)
+        if connector is not None and not connector.closed:
+            self._connectors.move_to_end(key)
+            return connector
+
+        stale: List[aiohttp.BaseConnector] = []
+        if connector is not None:
+            del self._connectors[key]
+
+        # Тип, адрес или учетные данные прокси изменились
+        old_key = self._keys.get(proxy.id)
+        if old_key is not None and old_key != key:
+            stale.append(self._connectors.pop(old_key))
+
+        connector = proxy.connector_factory()
+        self._connectors[key] = connector
+        self._keys[proxy.id] = key
+
+        while len(self._connectors) > self.max_size:
+            old_key, old_connector = self._connectors.popitem(last=False)
+            self._keys.pop(old_key[0], None)
+            stale.append(old_connector)
+
+        self._retire(stale)
+        return connector
+
+    async def invalidate(self, proxy_ids: Iterable[int]) -> None:
+        """
+        Удаление коннекторов для прокси из пула (закрываются спустя close_delay)
+
+        Args:
+            proxy_ids: Список ID прокси
+        """
+        stale = []
+        for proxy_id in proxy_ids:
+            key = self._keys.pop(proxy_id, None)
+            if key is not None:
+                stale.append(self._connectors.pop(key))
+        self._retire(stale)
+
+    async def close(self) -> None:
+        """Закрытие всех коннекторов пула, в том числе вытесненных"""
+        stale = list(self._connectors.values())
+        for connector, handle in self._retired.items():
+            handle.cancel()
+            stale.append(connector)
+        self._connectors.clear()
+        self._keys.clear()
+        self._retired.clear()
+        await self._close_all(stale)
+        if self._closing:
+            await asyncio.gather(*self._closing, return_exceptions=True)
+
+    def _retire(self, connectors: List[aiohttp.BaseConnector]) -> None:
+        if not connectors:
+            return
+        loop = asyncio.get_running_loop()
+        for connector in connectors:
+            self._retired[connector] = loop.call_later(self.close_delay, self._close_retired, connector)
+
+    def _close_retired(self, connector: aiohttp.BaseConnector) -> None:
+        if self._retired.pop(connector, None) is None:
+            return
+        task = asyncio.ensure_future(self._close_all([connector]))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    @staticmethod
+    async def _close_all(connectors: List[aiohttp.BaseConnector]) -> None:
+        for connector in connectors:
+            if not connector.closed:
+                await connector.close()
@@ -1,6 +1,18 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Callable, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
+from functools import partial
+
+import aiohttp
+from yarl import URL
+
+
+# Схемы URL для типов прокси, возвращаемых API
+_PROXY_SCHEMES = {
+    'http': 'http',
+    'socks': 'socks5',
+}
+
 
 
 @dataclass
@@ -41,6 +53,96 @@ class ProxyInfo:
             active=data.get('active', '0') == '1'
         )
 
+    def _cached(self, attr: str, build: Callable[[], Any]) -> Any:
+        # Кэш привязан к типу, адресу и учетным данным: при их изменении
+        # он сбрасывается без перехвата присваивания полей
+        key = (self.type, self.host, self.ip, self.port, self.user, self.password)
+        cache = self.__dict__.get('_cache')
+        if cache is None or cache[0] != key:
+            cache = self.__dict__['_cache'] = (key, {})
+        values = cache[1]
+        try:
+            return values[attr]
+        except KeyError:
+            value = values[attr] = build()
+            return value
+
+    @property
+    def scheme(self) -> str:
+        """Схема URL прокси (http, socks5)"""
+        return _PROXY_SCHEMES.get(self.type, self.type or 'http')
+
+    @property
+    def url(self) -> str:
+        """Полный URL прокси вместе с логином и паролем"""
+        return self._cached('url', lambda: str(URL.build(
+            scheme=self.scheme,
+            user=self.user or None,
+            password=(self.password or None) if self.user else None,
+            host=self.host or self.ip,
+            port=int(self.port) if self.port else None
+        )))
+
+    @property
+    def proxy_url(self) -> URL:
+        """URL прокси без учетных данных (для параметра proxy в aiohttp)"""
+        return self._cached('proxy_url', lambda: URL.build(
+            scheme=self.scheme,
+            host=self.host or self.ip,
+            port=int(self.port) if self.port else None
+        ))
+
+    @property
+    def proxy_auth(self) -> Optional[aiohttp.BasicAuth]:
+        """Авторизация на прокси (None, если логин не задан)"""
+        return self._cached('proxy_auth', lambda: (
+            aiohttp.BasicAuth(self.user, self.password) if self.user else None
+        ))
+
+    @property
+    def request_kwargs(self) -> Dict[str, Any]:
+        """
+        Параметры запроса aiohttp для работы через прокси
+
+        Для HTTP-прокси содержит proxy и proxy_auth, для SOCKS-прокси пуст,
+        так как маршрутизацию выполняет коннектор.
+        """
+        def build() -> Dict[str, Any]:
+            if self.scheme != 'http':
+                return {}
+            return {'proxy': self.proxy_url, 'proxy_auth': self.proxy_auth}
+
+        return dict(self._cached('request_kwargs', build))
+
+    @property
+    def connector_factory(self) -> Callable[[], aiohttp.BaseConnector]:
+        """
+        Фабрика коннекторов aiohttp для прокси
+
+        Для SOCKS-прокси требуется пакет aiohttp-socks
+        (pip install aioproxy6[socks]).
+
+        Raises:
+            ImportError: Если для SOCKS-прокси не установлен aiohttp-socks
+        """
+        def build() -> Callable[[], aiohttp.BaseConnector]:
+            if self.scheme == 'http':
+                return aiohttp.TCPConnector
+            try:
+                from aiohttp_socks import ProxyConnector
+            except ImportError as e:
+                raise ImportError(
+                    "Для SOCKS-прокси требуется aiohttp-socks: pip install aioproxy6[socks]"
+                ) from e
+            return partial(ProxyConnector.from_url, self.url)
+
+        return self._cached('connector_factory', build)
+
+    @property
+    def connector_key(self) -> Tuple[int, str]:
+        """Ключ коннектора в пуле: ID прокси и его полный URL"""
+        return self.id, self.url
+
 
 @dataclass
 class ProxyList:
@@ -169,7 +271,7 @@ class ProlongResult:
     user_id: int
     balance: float
     currency: str
-    price: float
+    price: Optional[float]
     period: int
     count: int
     proxies: List[ProlongProxyInfo]
@@ -188,12 +290,15 @@ class ProlongResult:
             for proxy_data in proxy_list:
                 proxies.append(ProlongProxyInfo.from_dict(proxy_data))
         
+        # None, если стоимость относится к объединенному запросу (BatchingTransport)
+        price = data.get('price', 0)
+
         return cls(
             status=data.get('status', ''),
             user_id=int(data.get('user_id', 0)),
             balance=float(data.get('balance', 0)),
             currency=data.get('currency', ''),
-            price=float(data.get('price', 0)),
+            price=float(price) if price is not None else None,
             period=int(data.get('period', 0)),
             count=int(data.get('count', 0)),
             proxies=proxies
@@ -0,0 +1,765 @@
+import aiohttp
+import asyncio
+import gzip
+import json
+import random
+import string
+import time
+from typing import Optional, List, Dict, Any, Callable, Iterable, Tuple
+
+
+def _params_key(method: str, params: Optional[Dict[str, Any]]) -> Tuple[str, Tuple[Tuple[str, str], ...]]:
+    """Ключ запроса, не зависящий от порядка и типов параметров"""
+    return method, tuple(sorted((k, str(v)) for k, v in (params or {}).items()))
+
+
+def _open_records(path: str, mode: str):
+    """Открытие файла записей (сжатого, если имя оканчивается на .gz)"""
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+class MissingRecordingError(LookupError):
+    """Исключение ReplayTransport: для запроса нет записанного ответа"""
+
+    def __init__(self, method: str, params: Dict[str, Any]):
+        self.method = method
+        self.params = params
+        super().__init__(f"No recorded response for {method} with params {params}")
+
+
+class BatchResultError(Exception):
+    """
+    Исключение BatchingTransport: результат объединенного запроса
+    нельзя распределить между вызывающими
+
+    Запрос был выполнен и мог частично изменить состояние прокси,
+    поэтому он не повторяется автоматически.
+    """
+
+    def __init__(self, method: str, ids: List[int], response: Dict[str, Any]):
+        self.method = method
+        self.ids = ids
+        self.response = response
+        super().__init__(
+            f"Batched {method} for ids {','.join(map(str, ids))} returned a result "
+            f"that cannot be attributed to callers: {response}"
+        )
+
+
+class BaseTransport:
+    """Базовый транспорт, выполняющий запросы к API"""
+
+    async def open(self) -> None:
+        """Подготовка транспорта к работе"""
+
+    async def close(self) -> None:
+        """Освобождение ресурсов транспорта"""
+
+    async def request(self, method: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Выполнение запроса
+
+        Args:
+            method: Метод API
+            params: Параметры запроса
+
+        Returns:
+            Ответ API в виде словаря (в том числе ответ с ошибкой)
+        """
+        raise NotImplementedError
+
+
+class HttpTransport(BaseTransport):
+    """Транспорт, выполняющий запросы к px6.link через aiohttp"""
+
+    def __init__(self, api_key: str,
+                 session: Optional[aiohttp.ClientSession] = None,
+                 base_url: str = "https://px6.link/api"):
+        """
+        Инициализация транспорта
+
+        Args:
+            api_key: API ключ
+            session: Сессия aiohttp (если None, будет создана новая)
+            base_url: Базовый URL API
+
+        """
+        self.api_key = api_key
+        self.base_url = base_url
+        self._session = session
+        self._own_session = session is None
+
+    async def open(self) -> None:
+        if self._own_session and self._session is None:
+            self._session = aiohttp.ClientSession()
+
+    async def close(self) -> None:
+        if self._own_session and self._session:
+            await self._session.close()
+            self._session = None
+
+    async def request(self, method: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        if self._session is None:
+            self._session = aiohttp.ClientSession()
+            self._own_session = True
+
+        # Формируем URL согласно документации: https://px6.link/api/{api_key}?method={method}&{params}
+        url = f"{self.base_url}/{self.api_key}/{method}"
+        async with self._session.get(url, params=params) as response:
+            return await response.json()
+
+
+class RecordingTransport(BaseTransport):
+    """
+    Транспорт, записывающий запросы и ответы другого транспорта
+
+    Каждая запись сразу дописывается в файл JSON Lines (gzip, если имя
+    оканчивается на .gz), поэтому записи не накапливаются в памяти
+    и не теряются без вызова close(). API ключ в файл не попадает.
+    """
+
+    def __init__(self, inner: BaseTransport, path: str):
+        """
+        Инициализация транспорта
+
+        Args:
+            inner: Транспорт, выполняющий реальные запросы
+            path: Путь к файлу записей (перезаписывается при первом запросе,
+                после повторного открытия транспорта записи дописываются)
+
+        """
+        self.inner = inner
+        self.path = path
+        self._file = None
+        self._started = False
+
+    async def open(self) -> None:
+        await self.inner.open()
+
+    async def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        await self.inner.close()
+
+    async def request(self, method: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        data = await self.inner.request(method, params)
+        if self._file is None:
+            self._file = _open_records(self.path, "a" if self._started else "w")
+            self._started = True
+        record = {"method": method, "params": dict(params or {}), "response": data}
+        self._file.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")))
+        self._file.write("\n")
+        self._file.flush()
+        return data
+
+
+class _SimulatedTransport(BaseTransport):
+    """Транспорт без сети с искусственной задержкой и ограничением параллелизма"""
+
+    def __init__(self, latency: float = 0.0, concurrency: Optional[int] = None):
+        self.latency = latency
+        self.concurrency = concurrency
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def request(self, method: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        if self.concurrency is None:
+            return await self._respond(method, params or {})
+
+        # Семафор создается внутри цикла событий (важно для Python < 3.10)
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        async with self._semaphore:
+            return await self._respond(method, params or {})
+
+    async def _respond(self, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        if self.latency > 0:
+            await asyncio.sleep(self.latency)
+        return self._handle(method, params)
+
+    def _handle(self, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        raise NotImplementedError
+
+
+class ReplayTransport(_SimulatedTransport):
+    """
+    Транспорт, воспроизводящий записанные ответы из памяти
+
+    Если один и тот же запрос записан несколько раз, ответы выдаются
+    по кругу в порядке записи. Для незаписанного запроса выбрасывается
+    MissingRecordingError.
+    """
+
+    def __init__(self, records: Iterable[Dict[str, Any]],
+                 latency: float = 0.0,
+                 concurrency: Optional[int] = None):
+        """
+        Инициализация транспорта
+
+        Args:
+            records: Записи вида {"method": ..., "params": ..., "response": ...}
+            latency: Задержка ответа (в секундах)
+            concurrency: Максимальное количество одновременных запросов
+
+        """
+        super().__init__(latency, concurrency)
+        self._responses: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], List[Dict[str, Any]]] = {}
+        self._positions: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], int] = {}
+        for record in records:
+            key = _params_key(record["method"], record.get("params"))
+            self._responses.setdefault(key, []).append(record["response"])
+
+    @classmethod
+    def from_file(cls, path: str, latency: float = 0.0, concurrency: Optional[int] = None) -> 'ReplayTransport':
+        """
+        Загрузка записей из файла, созданного RecordingTransport
+
+        Args:
+            path: Путь к файлу записей
+            latency: Задержка ответа (в секундах)
+            concurrency: Максимальное количество одновременных запросов
+
+        Returns:
+            Транспорт воспроизведения
+        """
+        records = []
+        with _open_records(path, "r") as f:
+            try:
+                for line in f:
+                    if line.strip():
+                        records.append(json.loads(line))
+            except EOFError:
+                # Сжатый файл, не закрытый при записи, не содержит завершающего блока
+                pass
+        return cls(records, latency, concurrency)
+
+    def _handle(self, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        key = _params_key(method, params)
+        responses = self._responses.get(key)
+        if not responses:
+            raise MissingRecordingError(method, dict(key[1]))
+
+        position = self._positions.get(key, 0)
+        self._positions[key] = (position + 1) % len(responses)
+        return responses[position]
+
+
+class FakeTransport(_SimulatedTransport):
+    """
+    Транспорт, имитирующий API px6.link в памяти процесса
+
+    Поддерживает баланс, остатки прокси по странам, покупку, продление,
+    удаление и истечение срока действия прокси. Время берется из clock,
+    что позволяет моделировать истечение прокси без ожидания.
+    """
+
+    # Срок до окончания, при котором прокси считается истекающим (в секундах)
+    EXPIRING_PERIOD = 3 * 86400
+
+    ERRORS = {
+        110: "Error method",
+        200: "Error count",
+        210: "Error period",
+        220: "Error country",
+        230: "Error ids",
+        240: "Error version",
+        260: "Error type",
+        400: "Error no money",
+    }
+
+    def __init__(self,
+                 balance: float = 1000.0,
+                 currency: str = "RUB",
+                 stock: Optional[Dict[str, int]] = None,
+                 prices: Optional[Dict[str, float]] = None,
+                 user_id: int = 1,
+                 clock: Callable[[], float] = time.time,
+                 seed: int = 0,
+                 latency: float = 0.0,
+                 concurrency: Optional[int] = None):
+        """
+        Инициализация транспорта
+
+        Args:
+            balance: Начальный баланс
+            currency: Валюта
+            stock: Количество доступных прокси по кодам стран
+            prices: Стоимость одного прокси за день по версиям ("3", "4", "6")
+            user_id: ID пользователя в ответах
+            clock: Источник текущего времени (unixtime)
+            seed: Начальное значение генератора адресов и учетных данных
+            latency: Задержка ответа (в секундах)
+            concurrency: Максимальное количество одновременных запросов
+
+        """
+        super().__init__(latency, concurrency)
+        self.balance = balance
+        self.currency = currency
+        self.stock = dict(stock) if stock is not None else {"ru": 1000, "us": 1000}
+        self.prices = dict(prices) if prices is not None else {"3": 0.5, "4": 3.0, "6": 0.1}
+        self.user_id = user_id
+        self.clock = clock
+        self.proxies: Dict[int, Dict[str, Any]] = {}
+        self.ip_auth: List[str] = []
+        self._random = random.Random(seed)
+        self._next_id = 1
+
+    def _base(self) -> Dict[str, Any]:
+        return {
+            "status": "yes",
+            "user_id": str(self.user_id),
+            "balance": f"{self.balance:.2f}",
+            "currency": self.currency,
+        }
+
+    def _error(self, error_id: int) -> Dict[str, Any]:
+        return {"status": "no", "error_id": error_id, "error": self.ERRORS[error_id]}
+
+    @staticmethod
+    def _format_time(unixtime: int) -> str:
+        return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(unixtime))
+
+    def _ids(self, params: Dict[str, Any]) -> Optional[List[int]]:
+        try:
+            ids = [int(i) for i in str(params.get("ids", "")).split(",") if i]
+        except ValueError:
+            return None
+        if not ids or any(i not in self.proxies for i in ids):
+            return None
+        return ids
+
+    @staticmethod
+    def _list(params: Dict[str, Any], items: Dict[str, Dict[str, Any]]) -> Any:
+        """Список в ответе: словарь по ID или, при nokey, простой список"""
+        if params.get("nokey"):
+            return list(items.values())
+        return items
+
+    def _proxy_view(self, proxy: Dict[str, Any], now: float) -> Dict[str, Any]:
+        view = dict(proxy)
+        view["active"] = "1" if proxy["unixtime_end"] > now else "0"
+        return view
+
+    def _handle(self, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        handler = getattr(self, f"_method_{method}", None)
+        if handler is None:
+            return self._error(110)
+        return handler(params)
+
+    def _method_getbalance(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        return self._base()
+
+    def _method_getprice(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        version = str(params.get("version", "6"))
+        if version not in self.prices:
+            return self._error(240)
+        count = int(params.get("count", 0))
+        period = int(params.get("period", 0))
+        if count < 1:
+            return self._error(200)
+        if period < 1:
+            return self._error(210)
+
+        price_single = self.prices[version] * period
+        data = self._base()
+        data.update({
+            "price": round(price_single * count, 2),
+            "price_single": round(price_single, 2),
+            "period": period,
+            "count": count,
+        })
+        return data
+
+    def _method_getcount(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        data = self._base()
+        data["count"] = self.stock.get(str(params.get("country", "")), 0)
+        return data
+
+    def _method_getcountry(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        data = self._base()
+        data["list"] = [country for country, count in self.stock.items() if count > 0]
+        return data
+
+    def _method_getproxy(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        now = self.clock()
+        state = params.get("state", "all")
+        descr = params.get("descr")
+        page = int(params.get("page", 1))
+        limit = int(params.get("limit", 1000))
+
+        selected = []
+        for proxy in self.proxies.values():
+            if descr and proxy["descr"] != descr:
+                continue
+            end = proxy["unixtime_end"]
+            if state == "active" and end <= now:
+                continue
+            if state == "expired" and end > now:
+                continue
+            if state == "expiring" and not now < end <= now + self.EXPIRING_PERIOD:
+                continue
+            selected.append(proxy)
+
+        start = (page - 1) * limit
+        data = self._base()
+        data["list_count"] = len(selected)
+        data["list"] = self._list(params, {
+            proxy["id"]: self._proxy_view(proxy, now)
+            for proxy in selected[start:start + limit]
+        })
+        return data
+
+    def _method_settype(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        ids = self._ids(params)
+        if ids is None:
+            return self._error(230)
+        proxy_type = params.get("type")
+        if proxy_type not in ("http", "socks"):
+            return self._error(260)
+        for proxy_id in ids:
+            self.proxies[proxy_id]["type"] = proxy_type
+        return self._base()
+
+    def _method_setdescr(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        old_descr = params.get("old")
+        ids = self._ids(params) if "ids" in params else None
+        if "ids" in params and ids is None:
+            return self._error(230)
+
+        count = 0
+        for proxy_id, proxy in self.proxies.items():
+            if ids is not None and proxy_id not in ids:
+                continue
+            if old_descr is not None and proxy["descr"] != old_descr:
+                continue
+            proxy["descr"] = params.get("new", "")
+            count += 1
+
+        data = self._base()
+        data["count"] = count
+        return data
+
+    def _method_buy(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        version = str(params.get("version", "6"))
+        if version not in self.prices:
+            return self._error(240)
+        country = str(params.get("country", ""))
+        if country not in self.stock:
+            return self._error(220)
+        proxy_type = params.get("type", "http")
+        if proxy_type not in ("http", "socks"):
+            return self._error(260)
+        count = int(params.get("count", 0))
+        period = int(params.get("period", 0))
+        if count < 1 or count > self.stock[country]:
+            return self._error(200)
+        if period < 1:
+            return self._error(210)
+
+        price = round(self.prices[version] * period * count, 2)
+        if price > self.balance:
+            return self._error(400)
+
+        self.balance -= price
+        self.stock[country] -= count
+        now = int(self.clock())
+        bought = {}
+        for _ in range(count):
+            proxy = self._create_proxy(version, proxy_type, country, now, period,
+                                       params.get("descr", ""))
+            self.proxies[int(proxy["id"])] = proxy
+            bought[proxy["id"]] = self._proxy_view(proxy, now)
+
+        data = self._base()
+        data.update({
+            "count": count,
+            "price": price,
+            "period": period,
+            "country": country,
+            "list": self._list(params, bought),
+        })
+        return data
+
+    def _create_proxy(self, version: str, proxy_type: str, country: str,
+                      now: int, period: int, descr: str) -> Dict[str, Any]:
+        proxy_id = self._next_id
+        self._next_id += 1
+        rnd = self._random
+        host = "{}.{}.{}.{}".format(185, rnd.randint(0, 255), rnd.randint(0, 255), rnd.randint(1, 254))
+        if version == "6":
+            ip = "2a00:1838:{:x}:{:x}::{:x}".format(rnd.getrandbits(16), rnd.getrandbits(16), proxy_id)
+        else:
+            ip = host
+        end = now + period * 86400
+        return {
+            "id": str(proxy_id),
+            "version": version,
+            "ip": ip,
+            "host": host,
+            "port": str(10000 + proxy_id % 50000),
+            "user": "".join(rnd.choice(string.ascii_letters) for _ in range(6)),
+            "pass": "".join(rnd.choice(string.ascii_letters + string.digits) for _ in range(6)),
+            "type": proxy_type,
+            "country": country,
+            "date": self._format_time(now),
+            "date_end": self._format_time(end),
+            "unixtime": now,
+            "unixtime_end": end,
+            "descr": descr,
+        }
+
+    def _method_prolong(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        ids = self._ids(params)
+        if ids is None:
+            return self._error(230)
+        period = int(params.get("period", 0))
+        if period < 1:
+            return self._error(210)
+
+        price = round(sum(self.prices[self.proxies[i]["version"]] for i in ids) * period, 2)
+        if price > self.balance:
+            return self._error(400)
+
+        self.balance -= price
+        now = int(self.clock())
+        prolonged = {}
+        for proxy_id in ids:
+            proxy = self.proxies[proxy_id]
+            # Истекший прокси продлевается от текущего момента
+            end = max(proxy["unixtime_end"], now) + period * 86400
+            proxy["unixtime_end"] = end
+            proxy["date_end"] = self._format_time(end)
+            prolonged[str(proxy_id)] = {
+                "id": proxy_id,
+                "date_end": proxy["date_end"],
+                "unixtime_end": end,
+            }
+
+        data = self._base()
+        data.update({
+            "price": price,
+            "period": period,
+            "count": len(ids),
+            "list": self._list(params, prolonged),
+        })
+        return data
+
+    def _method_delete(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        if "ids" in params:
+            ids = self._ids(params)
+            if ids is None:
+                return self._error(230)
+        elif "descr" in params:
+            ids = [i for i, proxy in self.proxies.items() if proxy["descr"] == params["descr"]]
+        else:
+            return self._error(230)
+
+        for proxy_id in ids:
+            del self.proxies[proxy_id]
+
+        data = self._base()
+        data["count"] = len(ids)
+        return data
+
+    def _method_check(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        ids = self._ids(params)
+        if ids is None:
+            return self._error(230)
+        data = self._base()
+        data["proxy_id"] = ids[0]
+        data["proxy_status"] = self.proxies[ids[0]]["unixtime_end"] > self.clock()
+        return data
+
+    def _method_ipauth(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        ip = str(params.get("ip", ""))
+        self.ip_auth = [] if ip in ("", "remove") else ip.split(",")
+        return self._base()
+
+
+class _Batch:
+    """Накапливаемый пакет запросов с одинаковыми параметрами"""
+
+    def __init__(self, method: str, params: Dict[str, Any]):
+        self.method = method
+        self.params = params
+        self.ids: List[int] = []
+        self.id_set = set()
+        self.callers: List[Tuple[List[int], asyncio.Future]] = []
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+    def add(self, ids: List[int], future: asyncio.Future) -> None:
+        self.ids.extend(ids)
+        self.id_set.update(ids)
+        self.callers.append((ids, future))
+
+    def remove(self, future: asyncio.Future) -> None:
+        self.callers = [caller for caller in self.callers if caller[1] is not future]
+        self.ids = [i for ids, _ in self.callers for i in ids]
+        self.id_set = set(self.ids)
+
+
+class BatchingTransport(BaseTransport):
+    """
+    Транспорт, объединяющий запросы по отдельным ID в один запрос
+
+    Запросы методов из BATCHABLE_METHODS с одинаковыми параметрами (кроме ids),
+    поступившие в течение window секунд, отправляются одним запросом
+    со списком ID через запятую, а ответ разделяется между вызывающими.
+    Если объединенный запрос завершился ошибкой API, запросы повторяются
+    по отдельности, чтобы каждый вызывающий получил свой результат.
+    Если объединенное удаление удалило не все прокси, повтор невозможен
+    (часть прокси уже удалена), и все вызывающие получают BatchResultError.
+
+    В разделенном ответе prolong стоимость (price) равна None: API не сообщает
+    стоимость продления каждого прокси, а она зависит от его версии.
+    Баланс в ответе относится к аккаунту после всего объединенного запроса.
+
+    Вызывающий, отмененный до отправки пакета, исключается из него.
+    """
+
+    BATCHABLE_METHODS = ("prolong", "settype", "delete")
+
+    def __init__(self, inner: BaseTransport, window: float = 0.01, max_ids: int = 100):
+        """
+        Инициализация транспорта
+
+        Args:
+            inner: Транспорт, выполняющий запросы
+            window: Время накопления пакета (в секундах)
+            max_ids: Максимальное количество ID в одном запросе
+
+        """
+        self.inner = inner
+        self.window = window
+        self.max_ids = max_ids
+        self._batches: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], _Batch] = {}
+        self._tasks = set()
+
+    async def open(self) -> None:
+        await self.inner.open()
+
+    async def close(self) -> None:
+        for key in list(self._batches):
+            self._flush(key)
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        await self.inner.close()
+
+    async def request(self, method: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        params = params or {}
+        if method not in self.BATCHABLE_METHODS or "ids" not in params:
+            return await self.inner.request(method, params)
+        try:
+            ids = [int(i) for i in str(params["ids"]).split(",") if i]
+        except ValueError:
+            return await self.inner.request(method, params)
+
+        other_params = {k: v for k, v in params.items() if k != "ids"}
+        key = _params_key(method, other_params)
+        loop = asyncio.get_running_loop()
+
+        batch = self._batches.get(key)
+        # Повторяющиеся ID не объединяются: продление одного прокси дважды
+        # не равно продлению один раз
+        if batch is not None and (batch.id_set.intersection(ids)
+                                  or len(batch.ids) + len(ids) > self.max_ids):
+            self._flush(key)
+            batch = None
+        if batch is None:
+            batch = self._batches[key] = _Batch(method, other_params)
+            batch.timer = loop.call_later(self.window, self._flush, key)
+
+        future = loop.create_future()
+        batch.add(ids, future)
+        if len(batch.ids) >= self.max_ids:
+            self._flush(key)
+        try:
+            return await future
+        except asyncio.CancelledError:
+            # Отмененный до отправки вызов не должен попасть в запрос
+            if self._batches.get(key) is batch:
+                batch.remove(future)
+                if not batch.callers:
+                    batch.timer.cancel()
+                    del self._batches[key]
+            raise
+
+    def _flush(self, key: Tuple[str, Tuple[Tuple[str, str], ...]]) -> None:
+        batch = self._batches.pop(key, None)
+        if batch is None:
+            return
+        if batch.timer is not None:
+            batch.timer.cancel()
+        task = asyncio.ensure_future(self._send(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, batch: _Batch) -> None:
+        try:
+            await self._dispatch(batch)
+        except BaseException as e:
+            # Ни один вызывающий не должен остаться без результата
+            for _, future in batch.callers:
+                if future.done():
+                    continue
+                if isinstance(e, asyncio.CancelledError):
+                    future.cancel()
+                else:
+                    future.set_exception(e)
+            if not isinstance(e, Exception):
+                raise
+
+    async def _dispatch(self, batch: _Batch) -> None:
+        params = dict(batch.params)
+        params["ids"] = ",".join(map(str, batch.ids))
+        data = await self.inner.request(batch.method, params)
+
+        if len(batch.callers) > 1 and data.get("status") == "no":
+            # Ошибка API означает, что запрос не выполнен, и его можно повторить
+            await asyncio.gather(*(self._send_single(batch, ids, future)
+                                   for ids, future in batch.callers))
+            return
+
+        # Удаленные прокси нельзя распределить между вызывающими
+        if (len(batch.callers) > 1 and batch.method == "delete"
+                and int(data.get("count", 0)) != len(batch.ids)):
+            raise BatchResultError(batch.method, batch.ids, data)
+
+        for ids, future in batch.callers:
+            if not future.done():
+                future.set_result(self._split(batch.method, data, ids, len(batch.ids)))
+
+    async def _send_single(self, batch: _Batch, ids: List[int], future: asyncio.Future) -> None:
+        params = dict(batch.params)
+        params["ids"] = ",".join(map(str, ids))
+        try:
+            data = await self.inner.request(batch.method, params)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+            return
+        if not future.done():
+            future.set_result(data)
+
+    @staticmethod
+    def _split(method: str, data: Dict[str, Any], ids: List[int], total: int) -> Dict[str, Any]:
+        """Выделение части объединенного ответа, относящейся к ids"""
+        if len(ids) == total:
+            return data
+
+        result = dict(data)
+        if method == "prolong":
+            wanted = set(map(str, ids))
+            proxy_list = data.get("list", {})
+            if isinstance(proxy_list, dict):
+                result["list"] = {k: v for k, v in proxy_list.items()
+                                  if str(v.get("id", k)) in wanted}
+            else:
+                result["list"] = [v for v in proxy_list if str(v.get("id")) in wanted]
+            result["count"] = len(ids)
+            result["price"] = None
+        elif method == "delete":
+            result["count"] = len(ids)
+        return result
@@ -29,5 +29,8 @@ setup(
     install_requires=[
         "aiohttp>=3.7.0",
     ],
+    extras_require={
+        "socks": ["aiohttp-socks>=0.5.0"],
+    },
     keywords="proxy, proxy6, px6, async, aiohttp, api client",
 ) 
\ No newline at end of file
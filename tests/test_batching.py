@@ -0,0 +1,226 @@
+import asyncio
+
+import pytest
+
+from aioproxy6 import (
+    PX6Client, ProxyType, BaseTransport, BatchingTransport,
+    BatchResultError, FakeTransport
+)
+from aioproxy6.client import PX6Exception
+
+
+class Counting(BaseTransport):
+    def __init__(self, inner: BaseTransport):
+        self.inner = inner
+        self.calls = []
+
+    async def request(self, method, params=None):
+        self.calls.append((method, dict(params or {})))
+        return await self.inner.request(method, params)
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def make_client(max_ids: int = 100, **fake_kwargs):
+    fake = FakeTransport(**fake_kwargs)
+    counting = Counting(fake)
+    client = PX6Client("key", transport=BatchingTransport(counting, window=0.01, max_ids=max_ids))
+    return client, counting, fake
+
+
+def test_merges_calls_with_same_params():
+    client, counting, _ = make_client(max_ids=50, balance=1000)
+
+    async def scenario():
+        bought = await client.buy_proxies(count=120, period=7, country="ru")
+        ids = [p.id for p in bought.proxies_list]
+        counting.calls.clear()
+
+        await asyncio.gather(*(client.set_proxy_type([i], ProxyType.SOCKS) for i in ids))
+        assert [len(p["ids"].split(",")) for _, p in counting.calls] == [50, 50, 20]
+
+        counting.calls.clear()
+        await asyncio.gather(
+            client.prolong_proxies([ids[0]], period=3),
+            client.prolong_proxies([ids[1]], period=3),
+            client.prolong_proxies([ids[2]], period=7),
+        )
+        assert sorted(p["period"] for _, p in counting.calls) == [3, 7]
+
+    run(scenario())
+
+
+def test_overlapping_ids_are_not_merged():
+    client, counting, fake = make_client(balance=1000)
+
+    async def scenario():
+        await client.buy_proxies(count=1, period=7, country="ru")
+        end = fake.proxies[1]["unixtime_end"]
+        counting.calls.clear()
+        await asyncio.gather(client.prolong_proxies([1], period=1),
+                             client.prolong_proxies([1], period=1))
+        assert len(counting.calls) == 2
+        assert fake.proxies[1]["unixtime_end"] == end + 2 * 86400
+
+    run(scenario())
+
+
+def test_splits_results_per_caller():
+    client, counting, _ = make_client(balance=1000, prices={"4": 10.0, "6": 1.0})
+
+    async def scenario():
+        await client.buy_proxies(count=2, period=7, country="ru")
+        counting.calls.clear()
+
+        results = await asyncio.gather(*(client.prolong_proxies([i], period=1) for i in (1, 2)))
+        assert len(counting.calls) == 1
+        for proxy_id, result in zip((1, 2), results):
+            assert result.count == 1
+            assert [p.id for p in result.proxies] == [proxy_id]
+            # Стоимость продления отдельного прокси неизвестна
+            assert result.price is None
+
+        single = await client.prolong_proxies([1], period=1)
+        assert single.price == 1
+
+        deleted = await asyncio.gather(client.delete_proxies([1]), client.delete_proxies([2]))
+        assert [d.count for d in deleted] == [1, 1]
+
+    run(scenario())
+
+
+def test_api_error_falls_back_to_single_requests():
+    client, counting, _ = make_client(balance=1000)
+
+    async def scenario():
+        await client.buy_proxies(count=2, period=7, country="ru")
+        counting.calls.clear()
+
+        results = await asyncio.gather(
+            client.delete_proxies([1]),
+            client.delete_proxies([42]),
+            client.delete_proxies([2]),
+            return_exceptions=True,
+        )
+        assert len(counting.calls) == 4
+        assert results[0].count == 1
+        assert isinstance(results[1], PX6Exception) and results[1].error_id == 230
+        assert results[2].count == 1
+
+    run(scenario())
+
+
+def test_partial_delete_fails_all_callers_without_retry():
+    class Deleting(BaseTransport):
+        def __init__(self, existing):
+            self.existing = set(existing)
+            self.calls = []
+
+        async def request(self, method, params=None):
+            ids = [int(i) for i in params["ids"].split(",")]
+            self.calls.append(ids)
+            deleted = self.existing.intersection(ids)
+            self.existing -= deleted
+            return {"status": "yes", "count": len(deleted)}
+
+    inner = Deleting({1, 2})
+    transport = BatchingTransport(inner, window=0.01)
+
+    async def scenario():
+        return await asyncio.gather(*(transport.request("delete", {"ids": str(i)}) for i in (1, 99, 2)),
+                                    return_exceptions=True)
+
+    results = run(scenario())
+    assert inner.calls == [[1, 99, 2]]
+    assert inner.existing == set()
+    assert all(isinstance(r, BatchResultError) for r in results)
+    assert results[0].response["count"] == 2
+
+
+def test_broken_response_does_not_hang_callers():
+    class Broken(BaseTransport):
+        async def request(self, method, params=None):
+            return {"status": "yes", "list": {"1": "oops", "2": "oops"}}
+
+    transport = BatchingTransport(Broken(), window=0.01)
+
+    async def scenario():
+        return await asyncio.wait_for(asyncio.gather(
+            transport.request("prolong", {"ids": "1", "period": 1}),
+            transport.request("prolong", {"ids": "2", "period": 1}),
+            return_exceptions=True,
+        ), timeout=1)
+
+    results = run(scenario())
+    assert all(isinstance(r, Exception) for r in results)
+
+
+def test_cancelled_inner_request_does_not_hang_callers():
+    class Cancelled(BaseTransport):
+        async def request(self, method, params=None):
+            raise asyncio.CancelledError()
+
+    transport = BatchingTransport(Cancelled(), window=0.01)
+
+    async def scenario():
+        return await asyncio.wait_for(asyncio.gather(
+            transport.request("settype", {"ids": "1", "type": "http"}),
+            transport.request("settype", {"ids": "2", "type": "http"}),
+            return_exceptions=True,
+        ), timeout=1)
+
+    results = run(scenario())
+    assert all(isinstance(r, asyncio.CancelledError) for r in results)
+
+
+def test_cancelled_caller_is_removed_from_pending_batch():
+    client, counting, fake = make_client(balance=1000)
+
+    async def scenario():
+        await client.buy_proxies(count=2, period=7, country="ru")
+        balance = fake.balance
+        counting.calls.clear()
+
+        abandoned = asyncio.ensure_future(client.prolong_proxies([1], period=1))
+        kept = asyncio.ensure_future(client.prolong_proxies([2], period=1))
+        await asyncio.sleep(0)
+        abandoned.cancel()
+
+        result = await kept
+        assert [p.id for p in result.proxies] == [2]
+        assert counting.calls == [("prolong", {"ids": "2", "period": 1})]
+        assert fake.balance == pytest.approx(balance - 0.1)
+
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(client.prolong_proxies([1], period=1), timeout=0.001)
+        await asyncio.sleep(0.05)
+        assert len(counting.calls) == 1
+
+    run(scenario())
+
+
+def test_other_methods_pass_through():
+    client, counting, _ = make_client()
+
+    async def scenario():
+        await asyncio.gather(client.get_balance(), client.get_balance())
+        assert len(counting.calls) == 2
+
+    run(scenario())
+
+
+def test_close_flushes_pending_batches():
+    client, counting, _ = make_client(balance=1000)
+
+    async def scenario():
+        await client.buy_proxies(count=1, period=7, country="ru")
+        transport = client.transport
+        transport.window = 60
+        pending = asyncio.ensure_future(client.set_proxy_type([1], ProxyType.SOCKS))
+        await asyncio.sleep(0)
+        await transport.close()
+        return await asyncio.wait_for(pending, timeout=1)
+
+    assert run(scenario()).status == "yes"
@@ -0,0 +1,192 @@
+import asyncio
+
+import pytest
+
+from aioproxy6 import (
+    PX6Client, ProxyState, ProxyType, ProxyVersion,
+    FakeTransport, HttpTransport, RecordingTransport, ReplayTransport,
+    MissingRecordingError
+)
+from aioproxy6.client import PX6Exception
+
+
+DAY = 86400
+
+
+class Clock:
+    def __init__(self, now: float = 1_700_000_000):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_session_and_transport_are_exclusive():
+    with pytest.raises(ValueError):
+        PX6Client("key", session=object(), transport=FakeTransport())
+
+
+def test_fake_buy_prolong_and_expiry():
+    clock = Clock()
+    fake = FakeTransport(balance=100, stock={"ru": 5}, prices={"6": 1.0}, clock=clock)
+
+    async def scenario():
+        client = PX6Client("key", transport=fake)
+        bought = await client.buy_proxies(count=2, period=7, country="ru")
+        assert [p.id for p in bought.proxies_list] == [1, 2]
+        assert bought.price == 14
+        assert bought.balance == 86
+        assert (await client.get_count("ru")).count == 3
+
+        clock.now += 5 * DAY
+        expiring = await client.get_proxies(state=ProxyState.EXPIRING)
+        assert expiring.list_count == 2
+
+        clock.now += 3 * DAY
+        assert (await client.get_proxies(state=ProxyState.EXPIRED)).list_count == 2
+        assert not (await client.check_proxy(1)).proxy_status
+
+        # Истекший прокси продлевается от текущего момента
+        prolonged = await client.prolong_proxies([1], period=3)
+        assert prolonged.price == 3
+        assert prolonged.balance == 83
+        assert prolonged.proxies[0].unixtime_end == clock.now + 3 * DAY
+        assert (await client.check_proxy(1)).proxy_status
+
+        active = await client.get_proxies(state=ProxyState.ACTIVE)
+        assert [p.id for p in active.proxies_list] == [1]
+
+    run(scenario())
+
+
+def test_fake_errors():
+    fake = FakeTransport(balance=1, stock={"ru": 1})
+
+    async def scenario():
+        client = PX6Client("key", transport=fake)
+        with pytest.raises(PX6Exception) as e:
+            await client.buy_proxies(count=2, period=7, country="ru")
+        assert e.value.error_id == 200
+        with pytest.raises(PX6Exception) as e:
+            await client.buy_proxies(count=1, period=365, country="ru")
+        assert e.value.error_id == 400
+        with pytest.raises(PX6Exception) as e:
+            await client.prolong_proxies([42], period=7)
+        assert e.value.error_id == 230
+
+    run(scenario())
+
+
+def test_fake_nokey_returns_list():
+    fake = FakeTransport()
+
+    async def scenario():
+        await fake.request("buy", {"count": 2, "period": 7, "country": "ru", "version": "6"})
+        keyed = await fake.request("getproxy", {"state": "all"})
+        plain = await fake.request("getproxy", {"state": "all", "nokey": 1})
+        assert sorted(keyed["list"]) == ["1", "2"]
+        assert [p["id"] for p in plain["list"]] == ["1", "2"]
+
+        client = PX6Client("key", transport=fake)
+        proxies = await client.get_proxies(nokey=True)
+        assert [p.id for p in proxies.proxies_list] == [1, 2]
+
+    run(scenario())
+
+
+@pytest.mark.parametrize("name", ["records.jsonl", "records.jsonl.gz"])
+def test_record_and_replay_round_trip(tmp_path, name):
+    path = str(tmp_path / name)
+    recorder = RecordingTransport(FakeTransport(balance=50), path)
+
+    async def record():
+        async with PX6Client("key", transport=recorder) as client:
+            first = await client.get_balance()
+            await client.buy_proxies(count=1, period=7, country="ru", proxy_type=ProxyType.SOCKS)
+            second = await client.get_balance()
+            price = await client.get_price(count=3, period=30, version=ProxyVersion.IPV4)
+            return first, second, price
+
+    async def replay():
+        transport = ReplayTransport.from_file(path, concurrency=2)
+        async with PX6Client("key", transport=transport) as client:
+            first = await client.get_balance()
+            second = await client.get_balance()
+            third = await client.get_balance()
+            price = await client.get_price(count=3, period=30, version=ProxyVersion.IPV4)
+            with pytest.raises(MissingRecordingError) as e:
+                await client.get_price(count=4, period=30)
+            assert e.value.method == "getprice"
+            assert e.value.params["count"] == "4"
+            return first, second, third, price
+
+    recorded = run(record())
+    first, second, third, price = run(replay())
+    assert (first, second, price) == recorded
+    # Повторяющиеся запросы воспроизводятся по кругу
+    assert third == first
+    assert first.balance != second.balance
+
+
+@pytest.mark.parametrize("name", ["records.jsonl", "records.jsonl.gz"])
+def test_recording_is_written_without_close(tmp_path, name):
+    path = str(tmp_path / name)
+    recorder = RecordingTransport(FakeTransport(), path)
+
+    async def record():
+        client = PX6Client("key", transport=recorder)
+        await client.get_balance()
+
+    run(record())
+    replay = ReplayTransport.from_file(path)
+    assert run(replay.request("getbalance"))["status"] == "yes"
+
+
+@pytest.mark.parametrize("name", ["records.jsonl", "records.jsonl.gz"])
+def test_recorder_keeps_records_across_sessions(tmp_path, name):
+    path = str(tmp_path / name)
+    recorder = RecordingTransport(FakeTransport(), path)
+
+    async def session(country):
+        async with PX6Client("key", transport=recorder) as client:
+            await client.get_count(country)
+
+    run(session("ru"))
+    run(session("us"))
+
+    replay = ReplayTransport.from_file(path)
+    assert run(replay.request("getcount", {"country": "ru", "version": "6"}))["count"] == 1000
+    assert run(replay.request("getcount", {"country": "us", "version": "6"}))["count"] == 1000
+
+
+def test_replay_concurrency_limit():
+    active = 0
+    peak = 0
+
+    class Probe(ReplayTransport):
+        async def _respond(self, method, params):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            try:
+                return await super()._respond(method, params)
+            finally:
+                active -= 1
+
+    transport = Probe([{"method": "getbalance", "params": {}, "response": {"status": "yes"}}],
+                      latency=0.001, concurrency=3)
+
+    async def scenario():
+        await asyncio.gather(*(transport.request("getbalance") for _ in range(20)))
+
+    run(scenario())
+    assert peak == 3
+
+
+def test_http_transport_is_default():
+    client = PX6Client("key")
+    assert isinstance(client.transport, HttpTransport)